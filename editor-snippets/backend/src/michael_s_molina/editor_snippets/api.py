@@ -1,11 +1,16 @@
-import json  # noqa: TID251
+import hashlib
 import logging
+import threading
+from typing import Any
 
+import zstandard
+from cachetools import TTLCache
 from flask import request, Response
 from flask_appbuilder.api import expose, permission_name, protect, safe
 from flask_login import current_user
+from orjson import dumps as _json_dumps, JSONDecodeError, loads as _json_loads
 from superset_core.common.daos import KeyValueDAO
-from superset_core.common.models import get_session
+from superset_core.common.models import get_session, KeyValue
 from superset_core.rest_api.api import RestApi
 from superset_core.rest_api.decorators import api
 
@@ -13,6 +18,99 @@ logger = logging.getLogger(__name__)
 
 RESOURCE_NAME = "editor_snippets"
 
+# Upper bound for request bodies, checked before anything is read
+MAX_BODY_BYTES = 1_048_576
+
+# Maps user_id -> KeyValue entry id so warm requests can address the row by
+# primary key.
+_entry_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_entry_cache_lock = threading.RLock()
+
+
+# Stored values are zstd-compressed JSON behind a one-byte format marker.
+# Values without the marker are legacy uncompressed JSON.
+_ZSTD_FORMAT = b"\x01"
+
+# zstd contexts are not thread-safe, so each thread gets its own pair
+_zstd_contexts = threading.local()
+
+
+def _encode_value(value: bytes) -> bytes:
+    cctx = getattr(_zstd_contexts, "compressor", None)
+    if cctx is None:
+        cctx = _zstd_contexts.compressor = zstandard.ZstdCompressor(level=3)
+    return _ZSTD_FORMAT + cctx.compress(value)
+
+
+def _decode_value(stored: bytes) -> bytes:
+    if not stored.startswith(_ZSTD_FORMAT):
+        return stored
+    dctx = getattr(_zstd_contexts, "decompressor", None)
+    if dctx is None:
+        dctx = _zstd_contexts.decompressor = zstandard.ZstdDecompressor()
+    return dctx.decompress(stored[1:])
+
+
+def _hash_value(value: bytes) -> bytes:
+    return hashlib.blake2b(value, digest_size=16).digest()
+
+
+def _remember_entry(user_id: int, entry_id: int) -> None:
+    with _entry_cache_lock:
+        _entry_cache[user_id] = entry_id
+
+
+def _forget_entry(user_id: int) -> None:
+    with _entry_cache_lock:
+        _entry_cache.pop(user_id, None)
+
+
+def _json_response(status: int, **kwargs: Any) -> Response:
+    """Serialize a response body with orjson, bypassing Flask's JSON encoder."""
+    return Response(_json_dumps(kwargs), status=status, mimetype="application/json")
+
+
+def _load_value(user_id: int) -> tuple[int, bytes] | None:
+    """Return the id and stored value of the user's snippets entry.
+
+    Only those two columns are selected, by primary key when the id is cached.
+    """
+    with _entry_cache_lock:
+        entry_id = _entry_cache.get(user_id)
+
+    query = (
+        get_session()
+        .query(KeyValue.id, KeyValue.value)
+        .filter_by(resource=RESOURCE_NAME, created_by_fk=user_id)
+    )
+    if entry_id is not None:
+        row = query.filter_by(id=entry_id).one_or_none()
+        if row is not None:
+            return row
+        _forget_entry(user_id)
+
+    return query.one_or_none()
+
+
+def _update_value(entry_id: int, user_id: int, value: bytes) -> bool:
+    """Overwrite the stored value with a single UPDATE, without loading the row.
+
+    The UPDATE only matches when the stored value differs, so re-saving what
+    is already stored writes nothing. Returns False when the row no longer
+    exists or belongs to someone else.
+    """
+    session = get_session()
+    query = session.query(KeyValue).filter_by(
+        id=entry_id, resource=RESOURCE_NAME, created_by_fk=user_id
+    )
+    updated = query.filter(KeyValue.value.is_distinct_from(value)).update(
+        {"value": value}, synchronize_session=False
+    )
+    if updated == 1:
+        return True
+    # Nothing was written: the row either already holds the value or is gone
+    return session.query(query.exists()).scalar()
+
 
 @api(id="editor_snippets", name="Editor Snippets")
 class EditorSnippetsAPI(RestApi):
@@ -26,17 +124,32 @@ class EditorSnippetsAPI(RestApi):
             return self.response(401, message="User not authenticated")
 
         try:
-            entry = KeyValueDAO.find_one_or_none(
-                resource=RESOURCE_NAME, created_by_fk=user_id
-            )
+            row = _load_value(user_id)
 
-            if entry is None:
-                return self.response(200, snippets=[])
+            if row is None:
+                return _json_response(200, snippets=[])
 
-            snippets = json.loads(entry.value.decode("utf-8"))
-            return self.response(200, snippets=snippets)
-        except Exception as e:
-            logger.exception("Failed to load snippets: %s", str(e))
+            entry_id, stored = row
+            value = _decode_value(stored)
+            _remember_entry(user_id, entry_id)
+
+            etag = _hash_value(value).hex()
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            elif request.args.get("validate") == "1":
+                response = _json_response(200, snippets=_json_loads(value))
+            else:
+                # The stored value is JSON this API serialized on PUT, so it
+                # can be embedded in the response as is.
+                response = Response(
+                    b'{"snippets":' + value + b"}",
+                    status=200,
+                    mimetype="application/json",
+                )
+            response.set_etag(etag)
+            return response
+        except Exception:
+            logger.exception("Failed to load snippets")
             return self.response(500, message="Failed to load snippets")
 
     @expose("/", methods=("PUT",))
@@ -48,27 +161,57 @@ class EditorSnippetsAPI(RestApi):
         if user_id is None:
             return self.response(401, message="User not authenticated")
 
+        if (request.content_length or 0) > MAX_BODY_BYTES:
+            return self.response(413, message="Payload too large")
+
+        if request.mimetype != "application/json":
+            return self.response(415, message="Content-Type must be application/json")
+
         try:
-            snippets = request.json.get("snippets", [])
-            value = json.dumps(snippets).encode("utf-8")
+            doc = _json_loads(request.get_data(cache=False))
+        except JSONDecodeError:
+            return self.response(400, message="Invalid JSON payload")
+
+        snippets = doc.get("snippets", []) if isinstance(doc, dict) else None
+        if not isinstance(snippets, list):
+            return self.response(400, message="Snippets must be a list")
+
+        try:
+            value = _json_dumps(snippets)
+            stored = _encode_value(value)
+
+            with _entry_cache_lock:
+                entry_id = _entry_cache.get(user_id)
+            if entry_id is not None:
+                if _update_value(entry_id, user_id, stored):
+                    get_session().commit()
+                    _remember_entry(user_id, entry_id)
+                    return self.response(200, message="Snippets saved")
+                _forget_entry(user_id)
 
             entry = KeyValueDAO.find_one_or_none(
                 resource=RESOURCE_NAME, created_by_fk=user_id
             )
 
             if entry is not None:
-                KeyValueDAO.update(entry, attributes={"value": value})
+                # Autosave clients frequently re-send what is already stored
+                if _decode_value(entry.value) == value:
+                    _remember_entry(user_id, entry.id)
+                    return self.response(200, message="Snippets saved")
+                KeyValueDAO.update(entry, attributes={"value": stored})
             else:
-                KeyValueDAO.create(
+                entry = KeyValueDAO.create(
                     attributes={
                         "resource": RESOURCE_NAME,
-                        "value": value,
+                        "value": stored,
                         "created_by_fk": user_id,
                     }
                 )
 
             get_session().commit()
+            _remember_entry(user_id, entry.id)
             return self.response(200, message="Snippets saved")
-        except Exception as e:
-            logger.exception("Failed to save snippets: %s", str(e))
+        except Exception:
+            _forget_entry(user_id)
+            logger.exception("Failed to save snippets")
             return self.response(500, message="Failed to save snippets")
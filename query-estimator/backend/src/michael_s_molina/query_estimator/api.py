@@ -21,21 +21,160 @@ Query Estimator REST API.
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, TYPE_CHECKING
 
-from flask import request, Response
+from cachetools import TTLCache
+from flask import current_app, Flask, g, request, Response
 from flask_appbuilder.api import expose, permission_name, protect
 from flask_babel import gettext as __
+from flask_login import current_user
+from orjson import dumps as _json_dumps
 from superset_core.common.daos import DatabaseDAO
 from superset_core.rest_api.api import RestApi
 from superset_core.rest_api.decorators import api
 from superset_core.queries.types import QueryOptions, QueryStatus
 
-from .parsers import detect_engine_type, get_parser
 from .types import EngineType
 
+if TYPE_CHECKING:
+    from .parsers import BaseParser
+
 logger = logging.getLogger(__name__)
 
+# Upper bound for request bodies, checked before anything is read
+MAX_BODY_BYTES = 1_048_576
+
+# How long an EXPLAIN may run, and how long a request waits for its result
+ESTIMATE_TIMEOUT_SECONDS = 60
+
+# EXPLAIN round-trips run here, so identical concurrent estimates can share
+# one.
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="query-estimator")
+
+# EXPLAINs currently running, by result cache key, so identical concurrent
+# estimates share a single round-trip.
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.RLock()
+
+# Recent estimates, so re-estimating unchanged SQL (e.g. dashboard refreshes)
+# skips the EXPLAIN round-trip entirely.
+_results: TTLCache = TTLCache(maxsize=1_000, ttl=120)
+_results_lock = threading.Lock()
+
+
+def _result_cache_key(
+    user_id: int,
+    database_id: int,
+    catalog: str | None,
+    schema: str | None,
+    sql: str,
+    build_tree: bool,
+) -> str:
+    """Build the result cache key, ignoring leading and trailing whitespace.
+
+    Whitespace inside the SQL is kept as is, since it can be significant in
+    string literals and quoted identifiers. The user is part of the key so
+    plans are never shared across users with different data access.
+    """
+    key = f"{user_id}|{database_id}|{catalog}|{schema}|{build_tree:d}|{sql.strip()}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _forget_inflight(cache_key: str) -> None:
+    with _inflight_lock:
+        _inflight.pop(cache_key, None)
+
+
+def _json_response(status: int, **kwargs: Any) -> Response:
+    """Serialize a response body with orjson, bypassing Flask's JSON encoder."""
+    return Response(_json_dumps(kwargs), status=status, mimetype="application/json")
+
+
+def _run_estimate(
+    app: Flask,
+    user: Any,
+    cache_key: str,
+    database_id: int,
+    parser: BaseParser,
+    engine_type: EngineType,
+    sql: str,
+    catalog: str | None,
+    schema: str | None,
+    build_tree: bool,
+) -> tuple[int, dict[str, Any]]:
+    """Execute EXPLAIN and parse it, returning an HTTP status and response body."""
+    with app.app_context():
+        g.user = user
+        try:
+            database = DatabaseDAO.find_one_or_none(id=database_id)
+            if database is None:
+                return 404, {"message": __("Database not found")}
+
+            explain_sql = parser.get_explain_sql(sql)
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Executing EXPLAIN for database %s (engine: %s)",
+                    database_id,
+                    engine_type.value,
+                )
+
+            # Execute EXPLAIN query
+            options = QueryOptions(
+                catalog=catalog,
+                schema=schema,
+                timeout_seconds=ESTIMATE_TIMEOUT_SECONDS,
+            )
+
+            result = database.execute(explain_sql, options)
+
+            if result.status != QueryStatus.SUCCESS:
+                error_msg = result.error_message or "EXPLAIN query failed"
+                logger.error("EXPLAIN failed: %s", error_msg)
+                return 500, {"message": error_msg}
+
+            if not result.statements or result.statements[0].data is None:
+                return 500, {"message": __("No EXPLAIN output received")}
+
+            # Get the explain output
+            explain_data = result.statements[0].data
+
+            # Parsers only read the first row, so avoid materializing the rest.
+            # For DataFrames the parsers derive the raw plan from the plan text
+            # itself, which skips formatting the frame with to_string().
+            raw_plan: str | None
+            if hasattr(explain_data, "to_dict"):
+                explain_output = explain_data.head(1).to_dict(orient="records")
+                raw_plan = None
+            else:
+                explain_output = explain_data
+                raw_plan = str(explain_data)
+
+            # Parse the EXPLAIN output
+            estimation_result = parser.parse_cached(
+                explain_output, raw_plan, build_tree
+            )
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Estimation complete: level=%s, warnings=%d",
+                    estimation_result.resource_level.value,
+                    len(estimation_result.warnings),
+                )
+
+            payload = {"result": estimation_result.to_dict()}
+            with _results_lock:
+                _results[cache_key] = payload
+            return 200, payload
+
+        except Exception as ex:
+            logger.exception("Error estimating query")
+            return 500, {"message": str(ex)}
+
 
 @api(id="query_estimator", name="Query Estimator")
 class QueryEstimatorAPI(RestApi):
@@ -50,25 +189,42 @@ class QueryEstimatorAPI(RestApi):
             databaseId: Database ID to execute against
             catalog: Optional catalog name
             schema: Optional schema name
+            planTree: Whether to build the plan tree (default true); metric-only
+                callers can pass false to skip it
         """
-        try:
-            body = request.json or {}
-            sql = body.get("sql")
-            database_id = body.get("databaseId")
-            catalog = body.get("catalog")
-            schema = body.get("schema")
+        if (request.content_length or 0) > MAX_BODY_BYTES:
+            return self.response(413, message=__("Request body is too large"))
+
+        if request.mimetype != "application/json":
+            return self.response(
+                415, message=__("Content-Type must be application/json")
+            )
+
+        body = request.get_json(cache=False, silent=True)
+        if not isinstance(body, dict):
+            return self.response(400, message=__("Invalid JSON payload"))
 
-            if not sql:
-                return self.response(400, message=__("SQL query is required"))
+        sql = body.get("sql")
+        database_id = body.get("databaseId")
+        catalog = body.get("catalog")
+        schema = body.get("schema")
+        build_tree = body.get("planTree", True) is not False
 
-            if not database_id:
-                return self.response(400, message=__("Database ID is required"))
+        if not sql:
+            return self.response(400, message=__("SQL query is required"))
 
+        if not database_id:
+            return self.response(400, message=__("Database ID is required"))
+
+        try:
             # Get database
             database = DatabaseDAO.find_one_or_none(id=database_id)
             if database is None:
                 return self.response(404, message=__("Database not found"))
 
+            # Parsers are only loaded once a request gets this far
+            from .parsers import detect_engine_type, get_parser
+
             # Detect engine type
             engine_type = detect_engine_type(database.backend)
 
@@ -82,60 +238,45 @@ class QueryEstimatorAPI(RestApi):
                     ),
                 )
 
-            # Get parser and build EXPLAIN query
-            parser = get_parser(engine_type)
-            explain_sql = parser.get_explain_sql(sql)
-
-            logger.info(
-                "Executing EXPLAIN for database %s (engine: %s)",
-                database_id,
-                engine_type.value,
-            )
-
-            # Execute EXPLAIN query
-            options = QueryOptions(
-                catalog=catalog,
-                schema=schema,
-            )
-
-            result = database.execute(explain_sql, options)
-
-            if result.status != QueryStatus.SUCCESS:
-                error_msg = result.error_message or "EXPLAIN query failed"
-                logger.error("EXPLAIN failed: %s", error_msg)
-                return self.response(500, message=error_msg)
-
-            if not result.statements or result.statements[0].data is None:
-                return self.response(
-                    500,
-                    message=__("No EXPLAIN output received"),
-                )
-
-            # Get the explain output
-            explain_data = result.statements[0].data
-            raw_plan = (
-                explain_data.to_string()
-                if hasattr(explain_data, "to_string")
-                else str(explain_data)
+            user = current_user._get_current_object()
+            cache_key = _result_cache_key(
+                user.id, database_id, catalog, schema, sql, build_tree
             )
+            with _results_lock:
+                cached = _results.get(cache_key)
+            if cached is not None:
+                return _json_response(200, **cached)
 
-            # Convert DataFrame to list of dicts for parsing
-            if hasattr(explain_data, "to_dict"):
-                explain_output = explain_data.to_dict(orient="records")
-            else:
-                explain_output = explain_data
-
-            # Parse the EXPLAIN output
-            estimation_result = parser.parse(explain_output, raw_plan)
+            parser = get_parser(engine_type)
+            app = current_app._get_current_object()
 
-            logger.info(
-                "Estimation complete: level=%s, warnings=%d",
-                estimation_result.resource_level.value,
-                len(estimation_result.warnings),
-            )
+            with _inflight_lock:
+                future = _inflight.get(cache_key)
+                if future is None:
+                    future = _executor.submit(
+                        _run_estimate,
+                        app,
+                        user,
+                        cache_key,
+                        database_id,
+                        parser,
+                        engine_type,
+                        sql,
+                        catalog,
+                        schema,
+                        build_tree,
+                    )
+                    _inflight[cache_key] = future
+                    future.add_done_callback(
+                        lambda _, key=cache_key: _forget_inflight(key)
+                    )
 
-            return self.response(200, result=estimation_result.to_dict())
+            try:
+                status, payload = future.result(timeout=ESTIMATE_TIMEOUT_SECONDS)
+            except FutureTimeout:
+                return self.response(504, message=__("Query estimation timed out"))
+            return _json_response(status, **payload)
 
         except Exception as ex:
-            logger.exception("Error estimating query: %s", str(ex))
+            logger.exception("Error estimating query")
             return self.response(500, message=str(ex))
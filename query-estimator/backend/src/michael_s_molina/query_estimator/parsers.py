@@ -24,11 +24,25 @@ No artificial estimates are made - only values reported by the database are used
 
 from __future__ import annotations
 
-import json
+import bisect
+import functools
+import hashlib
 import logging
 import re
+import sys
+import threading
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, ClassVar, Iterable, Iterator
+
+from cachetools import LRUCache
+from orjson import (
+    dumps as _json_dumps,
+    JSONDecodeError,
+    JSONEncodeError,
+    loads as _json_loads,
+    OPT_INDENT_2,
+    OPT_NON_STR_KEYS,
+)
 
 from .types import (
     EngineType,
@@ -59,6 +73,131 @@ COST_THRESHOLD_CRITICAL = 10_000_000  # Very high cost
 COST_THRESHOLD_HIGH = 1_000_000  # High cost
 COST_THRESHOLD_MEDIUM = 100_000  # Medium cost
 
+# Ascending (medium, high, critical) thresholds per metric for bisect
+_MEMORY_THRESHOLDS = (
+    MEMORY_THRESHOLD_MEDIUM,
+    MEMORY_THRESHOLD_HIGH,
+    MEMORY_THRESHOLD_CRITICAL,
+)
+_TIME_THRESHOLDS = (TIME_THRESHOLD_MEDIUM, TIME_THRESHOLD_HIGH, TIME_THRESHOLD_CRITICAL)
+_ROWS_THRESHOLDS = (ROWS_THRESHOLD_MEDIUM, ROWS_THRESHOLD_HIGH, ROWS_THRESHOLD_CRITICAL)
+_COST_THRESHOLDS = (COST_THRESHOLD_MEDIUM, COST_THRESHOLD_HIGH, COST_THRESHOLD_CRITICAL)
+_LEVELS = (
+    ResourceLevel.LOW,
+    ResourceLevel.MEDIUM,
+    ResourceLevel.HIGH,
+    ResourceLevel.CRITICAL,
+)
+
+# Warning titles, shared so deduplicate_warnings compares them by identity
+_TITLE_FULL_TABLE_SCAN = sys.intern("Full Table Scan")
+_TITLE_CARTESIAN_JOIN = sys.intern("Cartesian Join")
+_TITLE_EXCESSIVE_MEMORY = sys.intern("Excessive Memory Estimate")
+_TITLE_HIGH_MEMORY = sys.intern("High Memory Estimate")
+_TITLE_VERY_LARGE_RESULT = sys.intern("Very Large Result Set")
+_TITLE_LARGE_RESULT = sys.intern("Large Result Set")
+_TITLE_SEQUENTIAL_SCAN = sys.intern("Sequential Scan")
+_TITLE_CARTESIAN_PRODUCT = sys.intern("Cartesian Product")
+_TITLE_VERY_HIGH_COST = sys.intern("Very High Cost Query")
+_TITLE_HIGH_COST = sys.intern("High Cost Query")
+
+# Trino plan text patterns
+_MEMORY_RE = re.compile(
+    r"(?:Memory|estimatedMemory)[=:]\s*([\d.]+)\s*(B|KB|MB|GB|TB)", re.I
+)
+_ROWS_RE = re.compile(r"(?:rows|estimatedRows)[=:]\s*([\d,]+)", re.I)
+_FILTER_RE = re.compile(r"filterPredicate|constraint", re.I)
+
+# Byte multipliers for the units captured by _MEMORY_RE
+_UNIT_MULT = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+
+def _parse_line_rows(line: str) -> int | None:
+    """Extract the first ``rows=N`` / ``rows: N`` value from a plan line."""
+    text = line.lower()
+    length = len(text)
+    start = text.find("rows")
+    while start != -1:
+        idx = start + 4
+        if idx < length and text[idx] in "=:":
+            idx += 1
+            while idx < length and text[idx].isspace():
+                idx += 1
+            end = idx
+            while end < length and (text[end].isdecimal() or text[end] == ","):
+                end += 1
+            if end > idx:
+                return int(text[idx:end].replace(",", ""))
+        start = text.find("rows", start + 4)
+    return None
+
+
+def _find_table_scans(plan_str: str, limit: int) -> list[str]:
+    """Return the ``table = <name>`` value of the first ``limit`` TableScans.
+
+    Scans with ``str.find`` rather than a regex so large plans are never
+    backtracked over, and stops as soon as ``limit`` tables are found. The
+    ``table`` key must be on the ``TableScan[`` line.
+    """
+    tables: list[str] = []
+    length = len(plan_str)
+    pos = plan_str.find("TableScan[")
+    while pos != -1 and len(tables) < limit:
+        line_end = plan_str.find("\n", pos)
+        if line_end == -1:
+            line_end = length
+        next_pos = pos + 1
+        idx = plan_str.find("table", pos + 10, line_end)
+        while idx != -1:
+            end = idx + 5
+            while end < length and plan_str[end].isspace():
+                end += 1
+            if end < length and plan_str[end] == "=":
+                start = end + 1
+                while start < length and plan_str[start].isspace():
+                    start += 1
+                end = start
+                while end < length and not plan_str[end].isspace():
+                    end += 1
+                if end > start:
+                    tables.append(plan_str[start:end])
+                    next_pos = end
+                    break
+            idx = plan_str.find("table", idx + 1, line_end)
+        pos = plan_str.find("TableScan[", next_pos)
+    return tables
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of ``text`` like ``text.split("\\n")``, without the list."""
+    start = 0
+    end = text.find("\n")
+    while end != -1:
+        yield text[start:end]
+        start = end + 1
+        end = text.find("\n", start)
+    yield text[start:]
+
+
+def _parse_node_type(line: str) -> str:
+    """Extract the operator name from a stripped plan line.
+
+    e.g., "- Output[...]" -> "Output", "Fragment 0 [...]" -> "Fragment 0"
+    """
+    end = len(line)
+    for delimiter in "[(":
+        pos = line.find(delimiter, 0, end)
+        if pos != -1:
+            end = pos
+    return line[:end].strip().lstrip("- ") or "Unknown"
+
+
+# Unit tables for the formatters; scales are ordered largest first
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+_ROW_SCALES = ((1_000_000_000, "B"), (1_000_000, "M"), (1000, "K"))
+_TIME_SCALES = ((3_600_000, "hr", 1), (60_000, "min", 1), (1000, "sec", 2), (1, "ms", 1))
+_COST_SCALES = ((1_000_000, "M"), (1000, "K"))
+
 
 def format_bytes(bytes_val: int | None) -> str:
     """Format bytes to human readable string."""
@@ -66,67 +205,47 @@ def format_bytes(bytes_val: int | None) -> str:
         return "N/A"
     if bytes_val < 1024:
         return f"{bytes_val} B"
-    elif bytes_val < 1024**2:
-        return f"{bytes_val / 1024:.1f} KB"
-    elif bytes_val < 1024**3:
-        return f"{bytes_val / 1024**2:.1f} MB"
-    elif bytes_val < 1024**4:
-        return f"{bytes_val / 1024**3:.1f} GB"
-    else:
-        return f"{bytes_val / 1024**4:.1f} TB"
+    # Each unit spans 10 bits: KB is 2**10, MB is 2**20, ...
+    exponent = min((bytes_val.bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_val / 1024**exponent:.1f} {_BYTE_UNITS[exponent]}"
 
 
 def format_rows(rows: int | None) -> str:
     """Format row count to human readable string."""
     if rows is None:
         return "N/A"
-    if rows < 1000:
-        return str(rows)
-    elif rows < 1_000_000:
-        return f"{rows / 1000:.1f}K"
-    elif rows < 1_000_000_000:
-        return f"{rows / 1_000_000:.1f}M"
-    else:
-        return f"{rows / 1_000_000_000:.1f}B"
+    for threshold, suffix in _ROW_SCALES:
+        if rows >= threshold:
+            return f"{rows / threshold:.1f}{suffix}"
+    return str(rows)
 
 
 def format_time_ms(ms: float | None) -> str:
     """Format milliseconds to human readable string."""
     if ms is None:
         return "N/A"
-    if ms < 1:
-        return "< 1 ms"
-    elif ms < 1000:
-        return f"{ms:.1f} ms"
-    elif ms < 60000:
-        return f"{ms / 1000:.2f} sec"
-    elif ms < 3600000:
-        return f"{ms / 60000:.1f} min"
-    else:
-        return f"{ms / 3600000:.1f} hr"
+    for threshold, unit, precision in _TIME_SCALES:
+        if ms >= threshold:
+            return f"{ms / threshold:.{precision}f} {unit}"
+    return "< 1 ms"
 
 
 def format_cost(cost: float | None) -> str:
     """Format PostgreSQL cost units to human readable string."""
     if cost is None:
         return "N/A"
-    if cost < 1000:
-        return f"{cost:.0f}"
-    elif cost < 1_000_000:
-        return f"{cost / 1000:.1f}K"
-    else:
-        return f"{cost / 1_000_000:.1f}M"
+    for threshold, suffix in _COST_SCALES:
+        if cost >= threshold:
+            return f"{cost / threshold:.1f}{suffix}"
+    return f"{cost:.0f}"
 
 
 def deduplicate_warnings(warnings: list[Warning]) -> list[Warning]:
-    """Remove duplicate warnings based on title."""
-    seen_titles: set[str] = set()
-    unique_warnings: list[Warning] = []
+    """Remove duplicate warnings based on title, keeping the first occurrence."""
+    unique_warnings: dict[str, Warning] = {}
     for warning in warnings:
-        if warning.title not in seen_titles:
-            seen_titles.add(warning.title)
-            unique_warnings.append(warning)
-    return unique_warnings
+        unique_warnings.setdefault(warning.title, warning)
+    return list(unique_warnings.values())
 
 
 def calculate_resource_level(
@@ -135,59 +254,127 @@ def calculate_resource_level(
     memory_bytes: int | None = None,
     cost: float | None = None,
 ) -> ResourceLevel:
-    """Calculate overall resource level based on database-reported metrics."""
-    # Check memory (if provided by database)
-    if memory_bytes is not None:
-        if memory_bytes > MEMORY_THRESHOLD_CRITICAL:
-            return ResourceLevel.CRITICAL
-        if memory_bytes > MEMORY_THRESHOLD_HIGH:
-            return ResourceLevel.HIGH
-        if memory_bytes > MEMORY_THRESHOLD_MEDIUM:
-            return ResourceLevel.MEDIUM
-
-    # Check time (if provided by database)
-    if time_ms is not None:
-        if time_ms > TIME_THRESHOLD_CRITICAL:
-            return ResourceLevel.CRITICAL
-        if time_ms > TIME_THRESHOLD_HIGH:
-            return ResourceLevel.HIGH
-        if time_ms > TIME_THRESHOLD_MEDIUM:
-            return ResourceLevel.MEDIUM
-
-    # Check rows
-    if rows is not None:
-        if rows > ROWS_THRESHOLD_CRITICAL:
-            return ResourceLevel.CRITICAL
-        if rows > ROWS_THRESHOLD_HIGH:
-            return ResourceLevel.HIGH
-        if rows > ROWS_THRESHOLD_MEDIUM:
-            return ResourceLevel.MEDIUM
-
-    # Check cost (PostgreSQL-specific)
-    if cost is not None:
-        if cost > COST_THRESHOLD_CRITICAL:
-            return ResourceLevel.CRITICAL
-        if cost > COST_THRESHOLD_HIGH:
-            return ResourceLevel.HIGH
-        if cost > COST_THRESHOLD_MEDIUM:
-            return ResourceLevel.MEDIUM
+    """Calculate overall resource level based on database-reported metrics.
+
+    Metrics are checked in order (memory, time, rows, cost) and the first one
+    above its medium threshold decides the level.
+    """
+    for value, thresholds in (
+        (memory_bytes, _MEMORY_THRESHOLDS),
+        (time_ms, _TIME_THRESHOLDS),
+        (rows, _ROWS_THRESHOLDS),
+        (cost, _COST_THRESHOLDS),
+    ):
+        if value is not None:
+            # bisect_left counts the thresholds strictly below the value
+            level = bisect.bisect_left(thresholds, value)
+            if level:
+                return _LEVELS[level]
 
     return ResourceLevel.LOW
 
 
+# Parsed results by (parser class, digest of the EXPLAIN output), so the
+# same plan reissued by dashboards or retries is parsed only once
+_parse_cache: LRUCache = LRUCache(maxsize=512)
+_parse_cache_lock = threading.Lock()
+
+
+def _digest_output(explain_output: Any, raw_plan: str | None) -> bytes:
+    """Digest the parts of an EXPLAIN output that parsers read.
+
+    Parsers only read the first row. Text is hashed as is and other values
+    by their JSON encoding, so large plans are never formatted with repr().
+    Each part is prefixed with its type and length to keep parts apart.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    def update(value: Any) -> None:
+        value_type = type(value)
+        if value_type is dict:
+            digest.update(b"dict%d;" % len(value))
+            for name, item in value.items():
+                update(name)
+                update(item)
+            return
+        if value_type is str:
+            data = value.encode()
+        else:
+            try:
+                data = _json_dumps(value, option=OPT_NON_STR_KEYS)
+            except JSONEncodeError:
+                data = repr(value).encode()
+        digest.update(b"%s%d;" % (value_type.__name__.encode(), len(data)))
+        digest.update(data)
+
+    if type(explain_output) is list:
+        digest.update(b"rows;")
+        if explain_output:
+            update(explain_output[0])
+    else:
+        update(explain_output)
+    update(raw_plan)
+    return digest.digest()
+
+
 class BaseParser(ABC):
     """Abstract base class for EXPLAIN output parsers."""
 
-    @abstractmethod
+    # Prepended to the user's SQL to build the EXPLAIN statement
+    explain_prefix: ClassVar[str]
+
     def get_explain_sql(self, sql: str) -> str:
         """Generate the EXPLAIN SQL for this engine."""
-        ...
+        return self.explain_prefix + sql
 
     @abstractmethod
-    def parse(self, explain_output: Any, raw_plan: str) -> EstimationResult:
-        """Parse EXPLAIN output and return estimation result."""
+    def parse(
+        self,
+        explain_output: Any,
+        raw_plan: str | None = None,
+        build_tree: bool = True,
+    ) -> EstimationResult:
+        """Parse EXPLAIN output and return estimation result.
+
+        When ``raw_plan`` is not given, it is derived from the extracted plan.
+        Callers that only need metrics and warnings can pass
+        ``build_tree=False`` to skip building ``plan_tree``.
+        """
         ...
 
+    def parse_cached(
+        self,
+        explain_output: Any,
+        raw_plan: str | None = None,
+        build_tree: bool = True,
+    ) -> EstimationResult:
+        """Parse EXPLAIN output, reusing the result for identical output.
+
+        Cached results are shared between callers and must not be mutated.
+        """
+        key = (type(self), _digest_output(explain_output, raw_plan), build_tree)
+        with _parse_cache_lock:
+            result = _parse_cache.get(key)
+        if result is None:
+            result = self.parse(explain_output, raw_plan, build_tree)
+            with _parse_cache_lock:
+                _parse_cache[key] = result
+        return result
+
+    def parse_many(
+        self,
+        items: Iterable[tuple[Any, str | None]],
+        build_tree: bool = True,
+    ) -> Iterator[EstimationResult]:
+        """Parse a batch of ``(explain_output, raw_plan)`` pairs lazily.
+
+        Dashboards tend to issue many identical EXPLAINs, so repeated plans in
+        the batch are served from the parse cache.
+        """
+        parse = self.parse_cached
+        for explain_output, raw_plan in items:
+            yield parse(explain_output, raw_plan, build_tree)
+
 
 class TrinoParser(BaseParser):
     """Parser for Trino EXPLAIN output.
@@ -199,11 +386,15 @@ class TrinoParser(BaseParser):
     - Distribution information
     """
 
-    def get_explain_sql(self, sql: str) -> str:
-        # Use EXPLAIN without ANALYZE - plans but doesn't execute
-        return f"EXPLAIN (TYPE DISTRIBUTED, FORMAT JSON) {sql}"
+    # Use EXPLAIN without ANALYZE - plans but doesn't execute
+    explain_prefix = "EXPLAIN (TYPE DISTRIBUTED, FORMAT JSON) "
 
-    def parse(self, explain_output: Any, raw_plan: str) -> EstimationResult:
+    def parse(
+        self,
+        explain_output: Any,
+        raw_plan: str | None = None,
+        build_tree: bool = True,
+    ) -> EstimationResult:
         warnings: list[Warning] = []
         memory_bytes: int | None = None
         rows: int | None = None
@@ -211,11 +402,14 @@ class TrinoParser(BaseParser):
 
         try:
             plan_str = self._extract_plan_text(explain_output)
+            if raw_plan is None:
+                raw_plan = plan_str
 
             if plan_str:
                 memory_bytes, rows, warnings = self._parse_trino_plan(plan_str, warnings)
                 # Build tree from text plan
-                plan_tree = self._build_plan_tree(plan_str)
+                if build_tree:
+                    plan_tree = self._build_plan_tree(plan_str)
 
         except Exception as e:
             logger.warning(f"Error parsing Trino EXPLAIN output: {e}")
@@ -255,12 +449,15 @@ class TrinoParser(BaseParser):
 
     def _extract_plan_text(self, explain_output: Any) -> str:
         """Extract the plan text from various output formats."""
-        if isinstance(explain_output, str):
+        # Exact type checks: the output is built from plain lists, dicts and strs
+        output_type = type(explain_output)
+        if output_type is str:
             return explain_output
 
-        if isinstance(explain_output, list) and len(explain_output) > 0:
+        if output_type is list and explain_output:
             first_item = explain_output[0]
-            if isinstance(first_item, dict):
+            item_type = type(first_item)
+            if item_type is dict:
                 # Try common column names
                 for key in ["Query Plan", "QUERY PLAN", "query plan"]:
                     if key in first_item:
@@ -268,7 +465,7 @@ class TrinoParser(BaseParser):
                 # Return first value
                 for value in first_item.values():
                     return str(value)
-            elif isinstance(first_item, str):
+            elif item_type is str:
                 return first_item
 
         return str(explain_output)
@@ -282,35 +479,34 @@ class TrinoParser(BaseParser):
         memory_bytes: int | None = None
         rows: int | None = None
 
+        # The memory/rows patterns are case-insensitive, so guard them with a
+        # substring check on a lowercased copy before running the regexes
+        plan_lower = plan_str.lower()
+
         # Parse estimated memory (e.g., "Memory: 100MB" or "estimatedMemory=1.2GB")
-        memory_match = re.search(
-            r"(?:Memory|estimatedMemory)[=:]\s*([\d.]+)\s*(B|KB|MB|GB|TB)",
-            plan_str,
-            re.I,
-        )
+        memory_match = _MEMORY_RE.search(plan_str) if "memory" in plan_lower else None
         if memory_match:
             value = float(memory_match.group(1))
             unit = memory_match.group(2).upper()
-            multipliers = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
-            memory_bytes = int(value * multipliers.get(unit, 1))
+            memory_bytes = int(value * _UNIT_MULT.get(unit, 1))
 
         # Parse estimated rows (e.g., "rows=1000" or "estimatedRows: 1000")
-        rows_match = re.search(r"(?:rows|estimatedRows)[=:]\s*([\d,]+)", plan_str, re.I)
+        rows_match = _ROWS_RE.search(plan_str) if "rows" in plan_lower else None
         if rows_match:
             rows = int(rows_match.group(1).replace(",", ""))
 
         # Check for full table scans
         if "TableScan" in plan_str:
-            table_matches = re.findall(r"TableScan\[.*?table\s*=\s*(\S+)", plan_str)
+            table_matches = _find_table_scans(plan_str, limit=3)
             # Check if there's no filter pushdown
-            if table_matches and not re.search(r"filterPredicate|constraint", plan_str, re.I):
+            if table_matches and not _FILTER_RE.search(plan_str):
                 warnings.append(
                     Warning(
                         severity=WarningSeverity.WARNING,
-                        title="Full Table Scan",
+                        title=_TITLE_FULL_TABLE_SCAN,
                         description="No filter pushdown detected on table scan.",
                         recommendation="Add WHERE clause on partition column.",
-                        affected_tables=table_matches[:3],
+                        affected_tables=table_matches,
                     )
                 )
 
@@ -319,7 +515,7 @@ class TrinoParser(BaseParser):
             warnings.append(
                 Warning(
                     severity=WarningSeverity.CRITICAL,
-                    title="Cartesian Join",
+                    title=_TITLE_CARTESIAN_JOIN,
                     description="Cross join detected. This produces a cartesian product.",
                     recommendation="Add join conditions to reduce row explosion.",
                 )
@@ -333,88 +529,42 @@ class TrinoParser(BaseParser):
         Trino's text plan uses indentation to show hierarchy.
         Each line typically starts with operators like Fragment, Output, etc.
         """
-        lines = plan_str.strip().split("\n")
-        if not lines:
-            return None
-
-        # Parse lines into nodes based on indentation
-        def get_indent(line: str) -> int:
-            return len(line) - len(line.lstrip())
-
-        def parse_node_type(line: str) -> tuple[str, dict[str, Any]]:
-            """Extract node type and details from a line."""
-            line = line.strip()
-            details: dict[str, Any] = {}
-
-            # Try to extract rows info
-            rows_match = re.search(r"rows[=:]\s*([\d,]+)", line, re.I)
-            if rows_match:
-                details["rows"] = int(rows_match.group(1).replace(",", ""))
-
-            # Extract the main node type (first word or bracketed content)
-            # e.g., "- Output[...]" -> "Output"
-            # e.g., "Fragment 0 [...]" -> "Fragment 0"
-            node_match = re.match(r"[-\s]*([A-Za-z][A-Za-z0-9\s]*?)(?:\[|$|\s*\()", line)
-            if node_match:
-                node_type = node_match.group(1).strip()
-            else:
-                # Just use the first part of the line
-                node_type = line.split("[")[0].split("(")[0].strip().lstrip("- ")
-
-            return node_type or "Unknown", details
-
-        def build_tree(
-            lines: list[str], start_idx: int, parent_indent: int
-        ) -> tuple[list[PlanNode], int]:
-            """Recursively build tree from indented lines."""
-            nodes: list[PlanNode] = []
-            idx = start_idx
-
-            while idx < len(lines):
-                line = lines[idx]
-                if not line.strip():
-                    idx += 1
-                    continue
-
-                indent = get_indent(line)
-
-                if indent <= parent_indent and idx > start_idx:
-                    # This line belongs to parent or sibling
-                    break
-
-                node_type, details = parse_node_type(line)
-                rows = details.get("rows")
-
-                # Find children (lines with greater indentation)
-                children: list[PlanNode] = []
-                if idx + 1 < len(lines):
-                    next_indent = get_indent(lines[idx + 1]) if lines[idx + 1].strip() else indent
-                    if next_indent > indent:
-                        children, idx = build_tree(lines, idx + 1, indent)
-                    else:
-                        idx += 1
-                else:
-                    idx += 1
-
-                nodes.append(
-                    PlanNode(
-                        node_type=node_type,
-                        rows=rows,
-                        details=details,
-                        children=children,
-                    )
-                )
-
-            return nodes, idx
-
-        # Build the tree starting from root
-        nodes, _ = build_tree(lines, 0, -1)
+        roots: list[PlanNode] = []
+        # Nodes that can still receive children, as (indent, node) pairs
+        stack: list[tuple[int, PlanNode]] = []
+        last_is_open = False
+        # Bound locally so the loop avoids global lookups
+        parse_rows = _parse_line_rows
+        parse_node_type = _parse_node_type
+
+        for line in _iter_lines(plan_str.strip()):
+            stripped = line.strip()
+            if not stripped:
+                # A node directly followed by a blank line has no children
+                if last_is_open:
+                    stack.pop()
+                    last_is_open = False
+                continue
+
+            indent = len(line) - len(line.lstrip())
+            while stack and stack[-1][0] >= indent:
+                stack.pop()
+
+            rows = parse_rows(stripped)
+            node = PlanNode(
+                node_type=parse_node_type(stripped),
+                rows=rows,
+                details={"rows": rows} if rows is not None else {},
+            )
+            (stack[-1][1].children if stack else roots).append(node)
+            stack.append((indent, node))
+            last_is_open = True
 
-        if nodes:
+        if roots:
             # If multiple root nodes, wrap them in a Query node
-            if len(nodes) == 1:
-                return nodes[0]
-            return PlanNode(node_type="Query", children=nodes)
+            if len(roots) == 1:
+                return roots[0]
+            return PlanNode(node_type="Query", children=roots)
 
         return None
 
@@ -430,7 +580,7 @@ class TrinoParser(BaseParser):
             warnings.append(
                 Warning(
                     severity=WarningSeverity.CRITICAL,
-                    title="Excessive Memory Estimate",
+                    title=_TITLE_EXCESSIVE_MEMORY,
                     description=f"Estimated memory usage: {format_bytes(memory_bytes)}.",
                     recommendation="Add filters to reduce data volume or break into smaller queries.",
                 )
@@ -439,7 +589,7 @@ class TrinoParser(BaseParser):
             warnings.append(
                 Warning(
                     severity=WarningSeverity.WARNING,
-                    title="High Memory Estimate",
+                    title=_TITLE_HIGH_MEMORY,
                     description=f"Estimated memory usage: {format_bytes(memory_bytes)}.",
                     recommendation="Consider optimizing to reduce memory consumption.",
                 )
@@ -449,7 +599,7 @@ class TrinoParser(BaseParser):
             warnings.append(
                 Warning(
                     severity=WarningSeverity.CRITICAL,
-                    title="Very Large Result Set",
+                    title=_TITLE_VERY_LARGE_RESULT,
                     description=f"Planner estimates {format_rows(rows)} rows.",
                     recommendation="Add WHERE clause or LIMIT to reduce result size.",
                 )
@@ -458,7 +608,7 @@ class TrinoParser(BaseParser):
             warnings.append(
                 Warning(
                     severity=WarningSeverity.WARNING,
-                    title="Large Result Set",
+                    title=_TITLE_LARGE_RESULT,
                     description=f"Planner estimates {format_rows(rows)} rows.",
                     recommendation="Consider if all rows are needed.",
                 )
@@ -467,6 +617,12 @@ class TrinoParser(BaseParser):
         return warnings
 
 
+# PostgreSQL scan nodes, where actual data is read from tables
+_PG_SCAN_TYPES = frozenset(
+    {"Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+)
+
+
 class PostgresParser(BaseParser):
     """Parser for PostgreSQL EXPLAIN output.
 
@@ -477,11 +633,15 @@ class PostgresParser(BaseParser):
     - Does NOT provide memory or time estimates without ANALYZE
     """
 
-    def get_explain_sql(self, sql: str) -> str:
-        # Use EXPLAIN without ANALYZE - plans but doesn't execute
-        return f"EXPLAIN (FORMAT JSON, COSTS) {sql}"
+    # Use EXPLAIN without ANALYZE - plans but doesn't execute
+    explain_prefix = "EXPLAIN (FORMAT JSON, COSTS) "
 
-    def parse(self, explain_output: Any, raw_plan: str) -> EstimationResult:
+    def parse(
+        self,
+        explain_output: Any,
+        raw_plan: str | None = None,
+        build_tree: bool = True,
+    ) -> EstimationResult:
         warnings: list[Warning] = []
         rows_scanned: int = 0
         total_cost: float | None = None
@@ -489,6 +649,8 @@ class PostgresParser(BaseParser):
 
         try:
             plan_json = self._extract_plan_json(explain_output)
+            if raw_plan is None and plan_json is not None:
+                raw_plan = _json_dumps(plan_json, option=OPT_INDENT_2).decode()
 
             if plan_json and isinstance(plan_json, list) and len(plan_json) > 0:
                 plan_data = plan_json[0]
@@ -497,10 +659,10 @@ class PostgresParser(BaseParser):
                     plan = plan_data["Plan"]
                     # Get cost from root node
                     total_cost = plan.get("Total Cost")
-                    # Parse tree for warnings and sum of scanned rows
-                    rows_scanned, warnings = self._parse_plan_node(plan, warnings)
-                    # Build the plan tree for visualization
-                    plan_tree = self._build_plan_tree(plan)
+                    # Build the plan tree, collecting warnings and scanned rows
+                    plan_tree, rows_scanned = self._walk_plan(
+                        plan, warnings, build_tree
+                    )
 
         except Exception as e:
             logger.exception(f"Error parsing PostgreSQL EXPLAIN output: {e}")
@@ -540,120 +702,126 @@ class PostgresParser(BaseParser):
 
     def _extract_plan_json(self, explain_output: Any) -> list[dict] | None:
         """Extract the JSON plan from various output formats."""
-        if isinstance(explain_output, list) and len(explain_output) > 0:
+        # Exact type checks: the output is built from plain lists, dicts and strs
+        output_type = type(explain_output)
+        if output_type is list and explain_output:
             first_item = explain_output[0]
+            item_type = type(first_item)
 
-            if isinstance(first_item, dict):
+            if item_type is dict:
                 if "Plan" in first_item:
                     return [first_item]
                 elif "QUERY PLAN" in first_item:
                     json_str = first_item["QUERY PLAN"]
                     if isinstance(json_str, str):
-                        return json.loads(json_str)
+                        return _json_loads(json_str)
                     return json_str
                 else:
                     for value in first_item.values():
-                        if isinstance(value, str) and value.strip().startswith("["):
+                        if isinstance(value, list):
+                            return value
+                        # Only strings that open a JSON array are worth decoding
+                        if isinstance(value, str) and value.lstrip()[:1] == "[":
                             try:
-                                return json.loads(value)
-                            except json.JSONDecodeError:
+                                return _json_loads(value)
+                            except JSONDecodeError:
                                 pass
-                        elif isinstance(value, list):
-                            return value
-            elif isinstance(first_item, str):
-                return json.loads(first_item)
+            elif item_type is str:
+                return _json_loads(first_item)
 
-        elif isinstance(explain_output, str):
-            return json.loads(explain_output)
+        elif output_type is str:
+            return _json_loads(explain_output)
 
         return None
 
-    def _parse_plan_node(
+    def _walk_plan(
         self,
-        node: dict[str, Any],
+        root: dict[str, Any],
         warnings: list[Warning],
-    ) -> tuple[int, list[Warning]]:
-        """Recursively parse PostgreSQL plan nodes.
-
-        Returns the sum of rows from scan nodes (actual data read from tables),
-        not the inflated row counts from joins.
+        build_tree: bool = True,
+    ) -> tuple[PlanNode | None, int]:
+        """Build the PlanNode tree and collect warnings in a single pass.
+
+        Returns the tree and the sum of rows from scan nodes (actual data read
+        from tables), not the inflated row counts from joins. Nodes are visited
+        in pre-order with an explicit stack, so deep plans cannot hit the
+        recursion limit. No tree is built (``None``) when ``build_tree`` is off.
         """
         rows_scanned: int = 0
-        node_type = node.get("Node Type", "")
-        plan_rows = node.get("Plan Rows", 0)
-
-        # Scan nodes are where actual data is read from tables
-        scan_types = {"Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
-
-        if node_type in scan_types:
-            rows_scanned = int(plan_rows)
-            relation = node.get("Relation Name", "unknown")
-
-            # Warn about sequential scans on large tables
-            if node_type == "Seq Scan" and plan_rows > 100000:
-                warnings.append(
-                    Warning(
-                        severity=WarningSeverity.WARNING,
-                        title="Sequential Scan",
-                        description=f"Sequential scan on '{relation}' (~{format_rows(plan_rows)} rows).",
-                        recommendation="Consider adding an index or WHERE clause.",
-                        affected_tables=[relation],
+        # (plan node, children list of its parent PlanNode)
+        trees: list[PlanNode] = []
+        stack: list[tuple[dict[str, Any], list[PlanNode]]] = [(root, trees)]
+
+        while stack:
+            node, siblings = stack.pop()
+            get = node.get
+            node_type = get("Node Type")
+            rows = get("Plan Rows")
+            cost = get("Total Cost")
+            relation = get("Relation Name")
+            join_filter = get("Join Filter")
+
+            # Scan nodes are where actual data is read from tables
+            if node_type in _PG_SCAN_TYPES:
+                plan_rows = rows if rows is not None else 0
+                rows_scanned += int(plan_rows)
+
+                # Warn about sequential scans on large tables
+                if node_type == "Seq Scan" and plan_rows > 100000:
+                    table = relation if relation is not None else "unknown"
+                    warnings.append(
+                        Warning(
+                            severity=WarningSeverity.WARNING,
+                            title=_TITLE_SEQUENTIAL_SCAN,
+                            description=f"Sequential scan on '{table}' (~{format_rows(plan_rows)} rows).",
+                            recommendation="Consider adding an index or WHERE clause.",
+                            affected_tables=[table],
+                        )
                     )
-                )
 
-        # Check for nested loops without join conditions (cartesian product)
-        if node_type == "Nested Loop":
-            join_filter = node.get("Join Filter")
-            if not join_filter:
+            # Check for nested loops without join conditions (cartesian product)
+            if node_type == "Nested Loop" and not join_filter:
                 warnings.append(
                     Warning(
                         severity=WarningSeverity.CRITICAL,
-                        title="Cartesian Product",
+                        title=_TITLE_CARTESIAN_PRODUCT,
                         description="Nested loop without join condition detected.",
                         recommendation="Add JOIN conditions to avoid cartesian product.",
                     )
                 )
 
-        # Recursively process child nodes and sum their scanned rows
-        if "Plans" in node:
-            for child in node["Plans"]:
-                child_rows, warnings = self._parse_plan_node(child, warnings)
-                rows_scanned += child_rows
-
-        return rows_scanned, warnings
-
-    def _build_plan_tree(self, node: dict[str, Any]) -> PlanNode:
-        """Build a PlanNode tree from PostgreSQL EXPLAIN JSON."""
-        node_type = node.get("Node Type", "Unknown")
-        rows = node.get("Plan Rows")
-        cost = node.get("Total Cost")
-
-        # Build details dict with relevant info
-        details: dict[str, Any] = {}
-        if "Relation Name" in node:
-            details["table"] = node["Relation Name"]
-        if "Index Name" in node:
-            details["index"] = node["Index Name"]
-        if "Filter" in node:
-            details["filter"] = node["Filter"]
-        if "Join Filter" in node:
-            details["joinFilter"] = node["Join Filter"]
-        if "Sort Key" in node:
-            details["sortKey"] = node["Sort Key"]
-
-        # Build children recursively
-        children: list[PlanNode] = []
-        if "Plans" in node:
-            for child in node["Plans"]:
-                children.append(self._build_plan_tree(child))
-
-        return PlanNode(
-            node_type=node_type,
-            rows=int(rows) if rows is not None else None,
-            cost=float(cost) if cost is not None else None,
-            details=details,
-            children=children,
-        )
+            if build_tree:
+                # Build details dict with relevant info
+                details: dict[str, Any] = {}
+                if relation is not None:
+                    details["table"] = relation
+                index = get("Index Name")
+                if index is not None:
+                    details["index"] = index
+                plan_filter = get("Filter")
+                if plan_filter is not None:
+                    details["filter"] = plan_filter
+                if join_filter is not None:
+                    details["joinFilter"] = join_filter
+                sort_key = get("Sort Key")
+                if sort_key is not None:
+                    details["sortKey"] = sort_key
+
+                plan_node = PlanNode(
+                    node_type=node_type if node_type is not None else "Unknown",
+                    rows=int(rows) if rows is not None else None,
+                    cost=float(cost) if cost is not None else None,
+                    details=details,
+                )
+                siblings.append(plan_node)
+                siblings = plan_node.children
+
+            # Push children reversed so they are visited in plan order
+            child_plans = get("Plans")
+            if child_plans:
+                stack.extend((child, siblings) for child in reversed(child_plans))
+
+        return (trees[0] if trees else None), rows_scanned
 
     def _generate_threshold_warnings(
         self,
@@ -667,7 +835,7 @@ class PostgresParser(BaseParser):
             warnings.append(
                 Warning(
                     severity=WarningSeverity.CRITICAL,
-                    title="Very Large Result Set",
+                    title=_TITLE_VERY_LARGE_RESULT,
                     description=f"Planner estimates {format_rows(rows)} rows.",
                     recommendation="Add WHERE clause or LIMIT to reduce result size.",
                 )
@@ -676,7 +844,7 @@ class PostgresParser(BaseParser):
             warnings.append(
                 Warning(
                     severity=WarningSeverity.WARNING,
-                    title="Large Result Set",
+                    title=_TITLE_LARGE_RESULT,
                     description=f"Planner estimates {format_rows(rows)} rows.",
                     recommendation="Consider if all rows are needed.",
                 )
@@ -686,7 +854,7 @@ class PostgresParser(BaseParser):
             warnings.append(
                 Warning(
                     severity=WarningSeverity.CRITICAL,
-                    title="Very High Cost Query",
+                    title=_TITLE_VERY_HIGH_COST,
                     description=f"Query has cost of {format_cost(cost)} units.",
                     recommendation="Review query plan for optimization opportunities.",
                 )
@@ -695,7 +863,7 @@ class PostgresParser(BaseParser):
             warnings.append(
                 Warning(
                     severity=WarningSeverity.WARNING,
-                    title="High Cost Query",
+                    title=_TITLE_HIGH_COST,
                     description=f"Query has cost of {format_cost(cost)} units.",
                     recommendation="Consider adding indexes or filters.",
                 )
@@ -704,17 +872,20 @@ class PostgresParser(BaseParser):
         return warnings
 
 
+# Parsers are stateless, so a single instance per engine type is shared
+_PARSERS: dict[EngineType, BaseParser] = {
+    EngineType.TRINO: TrinoParser(),
+    EngineType.POSTGRES: PostgresParser(),
+}
+
+
 def get_parser(engine_type: EngineType) -> BaseParser:
     """Get the appropriate parser for the given engine type."""
-    if engine_type == EngineType.TRINO:
-        return TrinoParser()
-    elif engine_type == EngineType.POSTGRES:
-        return PostgresParser()
-    else:
-        # Default to Trino parser
-        return TrinoParser()
+    # Default to Trino parser
+    return _PARSERS.get(engine_type, _PARSERS[EngineType.TRINO])
 
 
+@functools.lru_cache(maxsize=16)
 def detect_engine_type(backend: str) -> EngineType:
     """Detect engine type from database backend string."""
     backend_lower = backend.lower()
@@ -46,7 +46,7 @@ class EngineType(str, Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class Warning:
     severity: WarningSeverity
     title: str
@@ -56,7 +56,7 @@ class Warning:
 
     def to_dict(self) -> dict[str, Any]:
         return {
-            "severity": self.severity.value,
+            "severity": self.severity,
             "title": self.title,
             "description": self.description,
             "recommendation": self.recommendation,
@@ -64,7 +64,7 @@ class Warning:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanNode:
     """Represents a node in the query execution plan tree."""
 
@@ -75,16 +75,30 @@ class PlanNode:
     children: list["PlanNode"] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
+        # Serialized with an explicit stack so deep plans don't recurse
+        root = self._to_node_dict()
+        stack = [(self, root)]
+        while stack:
+            node, node_dict = stack.pop()
+            children = node_dict["children"]
+            for child in node.children:
+                child_dict = child._to_node_dict()
+                children.append(child_dict)
+                stack.append((child, child_dict))
+        return root
+
+    def _to_node_dict(self) -> dict[str, Any]:
+        """Serialize this node, leaving its children list to be filled in."""
         return {
             "nodeType": self.node_type,
             "rows": self.rows,
             "cost": self.cost,
             "details": self.details,
-            "children": [c.to_dict() for c in self.children],
+            "children": [],
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EstimationMetrics:
     """
     Metrics extracted directly from database EXPLAIN output.
@@ -126,7 +140,7 @@ class EstimationMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EstimationResult:
     resource_level: ResourceLevel
     metrics: EstimationMetrics
@@ -137,10 +151,10 @@ class EstimationResult:
 
     def to_dict(self) -> dict[str, Any]:
         return {
-            "resourceLevel": self.resource_level.value,
+            "resourceLevel": self.resource_level,
             "metrics": self.metrics.to_dict(),
             "warnings": [w.to_dict() for w in self.warnings],
             "rawPlan": self.raw_plan,
             "planTree": self.plan_tree.to_dict() if self.plan_tree else None,
-            "engineType": self.engine_type.value,
+            "engineType": self.engine_type,
         }
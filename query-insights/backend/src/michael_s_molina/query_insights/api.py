@@ -5,7 +5,7 @@ from flask_appbuilder.api import expose, permission_name, protect, safe
 from superset_core.rest_api.api import RestApi
 from superset_core.rest_api.decorators import api
 
-from .service import get_query_metadata
+from .service import get_query_metadata_json
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +27,13 @@ class QueryInsightsAPI(RestApi):
         )
 
         try:
-            result = get_query_metadata(sql, default_schema)
-            return self.response(200, result=result)
+            # The metadata is cached pre-serialized, so embed it as is
+            result = get_query_metadata_json(sql, default_schema)
+            return Response(
+                b'{"result":' + result + b"}",
+                status=200,
+                mimetype="application/json",
+            )
 
         except Exception as e:
             logger.exception("Exception generating query insights: %s", str(e))
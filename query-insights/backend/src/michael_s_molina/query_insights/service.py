@@ -5,10 +5,80 @@ Core business logic for generating query metadata insights.
 Used by both the REST API and MCP tool.
 """
 
+import functools
 import random
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional
 
+from orjson import dumps as _json_dumps
+
+
+# Mock data - in production this would call an external service.
+# Built once at import; each call only copies the top-level table dicts,
+# so the nested values are shared and must not be mutated.
+_MOCK_TABLES: tuple[dict, ...] = (
+    {
+        "name": "public.dim_listings",
+        "description": "Dimension table containing listing attributes and metadata for all listings on the platform.",
+        "latestPartition": None,  # filled in per call
+        "retentionDays": 365,
+        "partitionScheme": "daily",
+        "isMidasCertified": True,
+        "dqScore": {"dataQualityScore": 92},
+        "ownerTeam": {
+            "name": "Listings Team",
+            "slackChannel": "listings-team",
+            "members": [
+                {"name": "Diana Prince", "profilePictureUrl": None},
+                {"name": "Clark Kent", "profilePictureUrl": None},
+                {"name": "Bruce Wayne", "profilePictureUrl": None},
+            ],
+        },
+        "exampleQueries": [
+            "SELECT * FROM public.dim_listings WHERE ds = '2024-01-01' LIMIT 100",
+            "SELECT listing_id, host_id, property_type FROM public.dim_listings WHERE country = 'US'",
+        ],
+    },
+    {
+        "name": "public.fact_reservations",
+        "description": "Fact table containing all reservation events including bookings, cancellations, and modifications.",
+        "latestPartition": None,  # filled in per call
+        "retentionDays": 730,
+        "partitionScheme": "daily",
+        "outputDelay": 2,
+        "isMidasCertified": True,
+        "dqScore": {"dataQualityScore": 88},
+        "ownerTeam": {
+            "name": "Reservations Team",
+            "slackChannel": "reservations",
+            "members": [
+                {"name": "Peter Parker", "profilePictureUrl": None},
+                {"name": "Mary Jane", "profilePictureUrl": None},
+            ],
+        },
+        "exampleQueries": [
+            "SELECT COUNT(*) FROM public.fact_reservations WHERE ds >= DATE '2024-01-01'",
+        ],
+    },
+    {
+        "name": "public.dim_users",
+        "description": "User dimension table with profile information and account details.",
+        "latestPartition": None,  # filled in per call
+        "retentionDays": 180,
+        "partitionScheme": "daily",
+        "isMidasCertified": False,
+        "dqScore": {"dataQualityScore": 75},
+        "ownerTeam": {
+            "name": "Identity Team",
+            "slackChannel": "identity",
+            "members": [
+                {"name": "Tony Stark", "profilePictureUrl": None},
+            ],
+        },
+        "exampleQueries": [],
+    },
+)
+
 
 def get_query_metadata(sql: str, default_schema: Optional[str] = None) -> dict:
     """
@@ -36,73 +106,34 @@ def get_query_metadata(sql: str, default_schema: Optional[str] = None) -> dict:
                 ...
             ]
         }
+
+        Results are cached per day and shared between callers, so they must
+        not be mutated.
     """
+    return _build_query_metadata(sql, default_schema, datetime.now().toordinal())
+
+
+def get_query_metadata_json(sql: str, default_schema: Optional[str] = None) -> bytes:
+    """Return ``get_query_metadata`` serialized as JSON, cached the same way."""
+    return _build_query_metadata_json(sql, default_schema, datetime.now().toordinal())
+
+
+@functools.lru_cache(maxsize=512)
+def _build_query_metadata_json(
+    sql: str, default_schema: Optional[str], day: int
+) -> bytes:
+    return _json_dumps(_build_query_metadata(sql, default_schema, day))
+
+
+@functools.lru_cache(maxsize=512)
+def _build_query_metadata(sql: str, default_schema: Optional[str], day: int) -> dict:
+    """Build the metadata for ``day`` (a date ordinal)."""
     # Generate a recent date for latest partition
-    today = datetime.now()
+    today = date.fromordinal(day)
     partition_date = (today - timedelta(days=random.randint(0, 3))).strftime("%Y-%m-%d")
 
-    # Mock data - in production this would call an external service
     return {
         "tables": [
-            {
-                "name": "public.dim_listings",
-                "description": "Dimension table containing listing attributes and metadata for all listings on the platform.",
-                "latestPartition": partition_date,
-                "retentionDays": 365,
-                "partitionScheme": "daily",
-                "isMidasCertified": True,
-                "dqScore": {"dataQualityScore": 92},
-                "ownerTeam": {
-                    "name": "Listings Team",
-                    "slackChannel": "listings-team",
-                    "members": [
-                        {"name": "Diana Prince", "profilePictureUrl": None},
-                        {"name": "Clark Kent", "profilePictureUrl": None},
-                        {"name": "Bruce Wayne", "profilePictureUrl": None},
-                    ],
-                },
-                "exampleQueries": [
-                    "SELECT * FROM public.dim_listings WHERE ds = '2024-01-01' LIMIT 100",
-                    "SELECT listing_id, host_id, property_type FROM public.dim_listings WHERE country = 'US'",
-                ],
-            },
-            {
-                "name": "public.fact_reservations",
-                "description": "Fact table containing all reservation events including bookings, cancellations, and modifications.",
-                "latestPartition": partition_date,
-                "retentionDays": 730,
-                "partitionScheme": "daily",
-                "outputDelay": 2,
-                "isMidasCertified": True,
-                "dqScore": {"dataQualityScore": 88},
-                "ownerTeam": {
-                    "name": "Reservations Team",
-                    "slackChannel": "reservations",
-                    "members": [
-                        {"name": "Peter Parker", "profilePictureUrl": None},
-                        {"name": "Mary Jane", "profilePictureUrl": None},
-                    ],
-                },
-                "exampleQueries": [
-                    "SELECT COUNT(*) FROM public.fact_reservations WHERE ds >= DATE '2024-01-01'",
-                ],
-            },
-            {
-                "name": "public.dim_users",
-                "description": "User dimension table with profile information and account details.",
-                "latestPartition": partition_date,
-                "retentionDays": 180,
-                "partitionScheme": "daily",
-                "isMidasCertified": False,
-                "dqScore": {"dataQualityScore": 75},
-                "ownerTeam": {
-                    "name": "Identity Team",
-                    "slackChannel": "identity",
-                    "members": [
-                        {"name": "Tony Stark", "profilePictureUrl": None},
-                    ],
-                },
-                "exampleQueries": [],
-            },
+            {**table, "latestPartition": partition_date} for table in _MOCK_TABLES
         ]
     }
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import functools
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
-from typing import Any
+from typing import Any, Callable, Iterator
 
+import httplib2
+import numpy as np
 import pandas as pd
 from flask import current_app, g, request, Response
 from flask_appbuilder.api import expose, permission_name, protect
 from flask_babel import gettext as __
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.model import JsonModel
+from orjson import dumps as _json_dumps, OPT_SERIALIZE_NUMPY
+from pandas.api.types import is_datetime64_any_dtype
 from superset_core.common.daos import DatabaseDAO
 from superset_core.rest_api.api import RestApi
 from superset_core.rest_api.decorators import api
@@ -17,6 +27,130 @@ from superset_core.queries.types import QueryOptions, QueryStatus
 
 logger = logging.getLogger(__name__)
 
+# Rows written per Sheets API request
+CHUNK_ROWS = 10_000
+
+# Retries, with exponential backoff, for each chunk write hitting a rate
+# limit or server error. Writes target a fixed range, so they are idempotent.
+CHUNK_RETRIES = 3
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+# Keys GSHEETS_SERVICE_ACCOUNT must define
+_REQUIRED_KEYS = (
+    "type",
+    "project_id",
+    "private_key_id",
+    "private_key",
+    "client_email",
+    "client_id",
+    "auth_uri",
+    "token_uri",
+)
+
+# Credentials built from the current GSHEETS_SERVICE_ACCOUNT config, keyed by
+# its contents so a config change builds new ones
+_credentials: tuple[tuple[Any, ...], service_account.Credentials] | None = None
+
+# Google API calls an export overlaps with its own work: sharing the
+# spreadsheet, and writing a chunk while the next one is converted
+_io_executor = ThreadPoolExecutor(
+    max_workers=16, thread_name_prefix="sqllab-gsheets-io"
+)
+
+# Discovery-built services wrap an httplib2.Http, which is not thread-safe,
+# so each thread keeps its own services and the connection they share
+_services = threading.local()
+
+
+def _to_cell_value(value: Any) -> Any:
+    """Format dates as ISO 8601 strings, leaving other values as they are."""
+    if isinstance(value, (date, datetime)):  # includes pd.Timestamp
+        return value.isoformat()
+    return value
+
+
+def _format_timestamps(column: pd.Series) -> pd.Series:
+    values = column.to_numpy()
+    if values.dtype.kind == "M":
+        # Naive whole-second timestamps are formatted in one NumPy pass,
+        # matching Timestamp.isoformat; anything finer or tz-aware isn't
+        nat = np.isnat(values)
+        if ((values.astype("datetime64[s]") == values) | nat).all():
+            strings = np.datetime_as_string(values, unit="s").astype(object)
+            strings[nat] = None
+            return pd.Series(strings, index=column.index, name=column.name)
+    return column.map(pd.Timestamp.isoformat, na_action="ignore")
+
+
+def _format_objects(column: pd.Series) -> pd.Series:
+    return column.map(_to_cell_value, na_action="ignore")
+
+
+def _pick_converter(dtype: Any) -> Callable[[pd.Series], pd.Series] | None:
+    """Pick how to format a column from its dtype, or None to keep it as is."""
+    if is_datetime64_any_dtype(dtype):
+        return _format_timestamps
+    if dtype == object:
+        # Object columns may mix dates with other values
+        return _format_objects
+    return None
+
+
+class _OrjsonModel(JsonModel):
+    """JSON model that serializes request bodies with orjson.
+
+    Sheets and Drive don't use the ``dataWrapper`` feature, so bodies are
+    sent as is.
+    """
+
+    def serialize(self, body_value: Any) -> bytes:
+        return _json_dumps(body_value, option=OPT_SERIALIZE_NUMPY)
+
+
+_MODEL = _OrjsonModel()
+
+
+def _get_service(name: str, version: str, creds: service_account.Credentials) -> Any:
+    """Return a Google API service for ``creds``, built once per thread.
+
+    All services of a thread share one authorized ``httplib2.Http``, so its
+    open connections are reused across API calls and exports.
+    """
+    cache = getattr(_services, "cache", None)
+    if cache is None:
+        cache = _services.cache = {}
+    key = (name, version, creds)
+    service = cache.get(key)
+    if service is None:
+        http = cache.get(creds)
+        if http is None:
+            http = cache[creds] = AuthorizedHttp(creds, http=httplib2.Http())
+        document = _discovery_document(name, version)
+        if document is not None:
+            service = build_from_document(document, http=http, model=_MODEL)
+        else:
+            service = build(
+                name, version, http=http, model=_MODEL, cache_discovery=False
+            )
+        cache[key] = service
+    return service
+
+
+@functools.lru_cache(maxsize=None)
+def _discovery_document(name: str, version: str) -> str | None:
+    """Read the discovery document bundled with the API client, once.
+
+    The JSON text is cached rather than the parsed document, because
+    building a service mutates the document it is given; each build
+    parses its own copy. Returns None when the client does not ship a
+    document for the API.
+    """
+    return get_static_doc(name, version)
+
 
 @api(id="sqllab_gsheets", name="SQL Lab Google Sheets Export")
 class GSheetsExportAPI(RestApi):
@@ -53,44 +187,67 @@ class GSheetsExportAPI(RestApi):
 
             # 3. Execute query
             df = self._execute_query(database, sql, catalog, schema)
+            row_count = df.shape[0]
 
             # 4. Get Google Sheets credentials
             creds = self._get_credentials()
 
             # 5. Create new spreadsheet
-            service = build("sheets", "v4", credentials=creds)
+            service = _get_service("sheets", "v4", creds)
             title = f"SQL_Export_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
+            # The grid is sized to the header plus all rows up front, since
+            # writes to fixed ranges past the grid's end are rejected
+            grid = {
+                "rowCount": row_count + 1,
+                "columnCount": max(len(df.columns), 1),
+            }
             spreadsheet = (
                 service.spreadsheets()
-                .create(body={"properties": {"title": title}})
+                .create(
+                    body={
+                        "properties": {"title": title},
+                        "sheets": [{"properties": {"gridProperties": grid}}],
+                    }
+                )
                 .execute()
             )
             spreadsheet_id = spreadsheet["spreadsheetId"]
             spreadsheet_url = spreadsheet["spreadsheetUrl"]
 
-            # 6. Write data to spreadsheet
-            values = self._dataframe_to_values(df)
-            service.spreadsheets().values().update(
-                spreadsheetId=spreadsheet_id,
-                range="A1",
-                valueInputOption="RAW",
-                body={"values": values},
-            ).execute()
+            # 6. Share spreadsheet with current user while the data is written
+            user_email = g.user.email if g.user else None
+            shared = _io_executor.submit(
+                self._share_with_user, creds, spreadsheet_id, user_email
+            )
 
-            # 7. Share spreadsheet with current user
-            self._share_with_user(creds, spreadsheet_id)
+            # 7. Write data to spreadsheet, a chunk of rows at a time. Each
+            # chunk is written in the background while the next one is
+            # converted; writes still happen one after another, in order.
+            start_row = 1
+            written = None
+            for values in self._iter_value_chunks(df):
+                if written is not None:
+                    written.result()
+                written = _io_executor.submit(
+                    self._write_values, creds, spreadsheet_id, start_row, values
+                )
+                start_row += len(values)
+
+            if written is not None:
+                written.result()
+            shared.result()
 
             logger.info(
                 "Exported %d rows to Google Sheets: %s",
-                len(df.index),
+                row_count,
                 spreadsheet_url,
             )
 
             return self.response(
                 200,
                 spreadsheet_url=spreadsheet_url,
-                row_count=len(df.index),
+                row_count=row_count,
             )
 
         except Exception as ex:
@@ -134,22 +291,23 @@ class GSheetsExportAPI(RestApi):
         - client_id: Client ID
         - auth_uri: Auth URI (usually "https://accounts.google.com/o/oauth2/auth")
         - token_uri: Token URI (usually "https://oauth2.googleapis.com/token")
+
+        The credentials are built once and reused until the config changes.
         """
+        global _credentials
+
         service_account_info = current_app.config.get("GSHEETS_SERVICE_ACCOUNT")
         if not service_account_info:
             raise ValueError(__("GSHEETS_SERVICE_ACCOUNT config is not set"))
 
-        required_keys = [
-            "type",
-            "project_id",
-            "private_key_id",
-            "private_key",
-            "client_email",
-            "client_id",
-            "auth_uri",
-            "token_uri",
+        key = tuple(sorted(service_account_info.items()))
+        cached = _credentials
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        missing_keys = [
+            name for name in _REQUIRED_KEYS if name not in service_account_info
         ]
-        missing_keys = [key for key in required_keys if key not in service_account_info]
 
         if missing_keys:
             raise ValueError(
@@ -159,44 +317,79 @@ class GSheetsExportAPI(RestApi):
                 )
             )
 
-        return service_account.Credentials.from_service_account_info(
+        creds = service_account.Credentials.from_service_account_info(
             service_account_info,
-            scopes=[
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive",
-            ],
+            scopes=SCOPES,
         )
+        _credentials = (key, creds)
+        return creds
+
+    def _iter_value_chunks(
+        self, df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS
+    ) -> Iterator[list[list[Any]]]:
+        """Yield the sheet values in chunks of rows, the first led by the header.
+
+        Only one chunk is converted at a time, which bounds the memory used
+        on top of the DataFrame and the size of each request body.
+        """
+        yield self._dataframe_to_values(df.iloc[:chunk_rows])
+        for start in range(chunk_rows, len(df.index), chunk_rows):
+            yield self._dataframe_to_rows(df.iloc[start : start + chunk_rows])
 
     def _dataframe_to_values(self, df: pd.DataFrame) -> list[list[Any]]:
         """Convert DataFrame to list of lists for Google Sheets API."""
         # Header row
         header = df.columns.tolist()
 
-        # Data rows - convert to native Python types
-        data_rows = []
-        for _, row in df.iterrows():
-            row_values = []
-            for val in row:
-                if pd.isna(val):
-                    row_values.append("")
-                elif isinstance(val, (date, datetime, pd.Timestamp)):
-                    row_values.append(val.isoformat())
-                else:
-                    row_values.append(val)
-            data_rows.append(row_values)
-
-        return [header] + data_rows
+        return [header] + self._dataframe_to_rows(df)
+
+    def _dataframe_to_rows(self, df: pd.DataFrame) -> list[list[Any]]:
+        """Convert DataFrame rows to lists of native Python values.
+
+        Values are converted column by column, with a converter picked once
+        per column from its dtype; only datetime and object columns need a
+        per-cell pass to format dates.
+        """
+        converters = [_pick_converter(dtype) for dtype in df.dtypes]
+        columns = []
+        for (_, column), convert in zip(df.items(), converters):
+            if convert is not None:
+                column = convert(column)
+            columns.append(column.astype(object).where(column.notna(), "").tolist())
+
+        return [list(row) for row in zip(*columns)]
+
+    def _write_values(
+        self,
+        creds: service_account.Credentials,
+        spreadsheet_id: str,
+        start_row: int,
+        values: list[list[Any]],
+    ) -> None:
+        """Write rows to the spreadsheet, starting at ``start_row``."""
+        service = _get_service("sheets", "v4", creds)
+        service.spreadsheets().values().update(
+            spreadsheetId=spreadsheet_id,
+            range=f"A{start_row}",
+            valueInputOption="RAW",
+            body={"values": values},
+        ).execute(num_retries=CHUNK_RETRIES)
 
     def _share_with_user(
-        self, creds: service_account.Credentials, spreadsheet_id: str
+        self,
+        creds: service_account.Credentials,
+        spreadsheet_id: str,
+        user_email: str | None,
     ) -> None:
-        """Share the spreadsheet with the current user."""
-        user_email = g.user.email if g.user else None
+        """Share the spreadsheet with the current user.
+
+        Runs on the I/O executor, so the email is resolved by the caller.
+        """
         if not user_email:
             logger.warning("No user email found, skipping sharing")
             return
 
-        drive_service = build("drive", "v3", credentials=creds)
+        drive_service = _get_service("drive", "v3", creds)
         drive_service.permissions().create(
             fileId=spreadsheet_id,
             body={